@@ -0,0 +1,36 @@
+from typing import Optional
+
+
+def reference_construct_change(coins: dict, amount: int) -> Optional[list]:
+	"""Reference implementation of the change-making algorithm used by the vending machine.
+
+	This is the original dynamic programming approach and defines the expected behaviour
+	for any alternative change engine: the returned list uses the minimum number of coins
+	available in `coins`, or is `None` when the change cannot be constructed.
+
+	It is deliberately kept frozen - faster engines should be checked against it
+	(see `src.app.fuzzing`) rather than replacing it.
+
+	Keyword arguments:
+	coins -- the available balances of each coin denomination, sorted by denomination (required)
+	amount -- the change amount to construct in pence (required)
+	"""
+
+	dp = [amount + 1] * (amount + 1)
+	lst = [None] * (amount + 1)
+
+	dp[0] = 0
+	lst[0] = []
+
+	for c in coins:
+		for _ in range(coins[c]):
+			for a in range(amount, -1, -1):
+				if a - c < 0:
+					break
+
+				if a - c >= 0:
+					if 1 + dp[a - c] < dp[a]:
+						dp[a] = 1 + dp[a - c]
+						lst[a] = [c] + lst[a-c]
+
+	return lst[amount] if dp[amount] != amount + 1 else None
@@ -0,0 +1,270 @@
+import math
+import random
+import statistics
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from src.app.change import reference_construct_change
+from src.app.utilities import COIN_DENOMINATIONS
+
+
+# denomination sets on which a greedy approach does not give the minimum number of coins
+NON_CANONICAL_DENOMINATIONS = [
+	[1, 3, 4],
+	[1, 5, 6, 9],
+	[1, 7, 10],
+	[1, 10, 25],
+	[1, 15, 25],
+	[2, 3],
+	[4, 7, 9],
+	[3, 5, 11, 13],
+]
+
+REFERENCE_ENGINE = 'reference'
+
+
+class ChangeCase(BaseModel):
+	""" Defines a single randomly generated change-making case.
+
+	Keyword arguments:
+	kind -- the strategy used to generate the case (required)
+	coins -- the balances of each coin denomination, sorted by denomination (required)
+	amount -- the change amount to construct in pence (required)
+	"""
+
+	kind: str
+	coins: dict
+	amount: int
+
+
+class Mismatch(BaseModel):
+	""" Defines a case on which an engine disagreed with the reference engine.
+
+	Keyword arguments:
+	engine -- the name of the engine that disagreed (required)
+	case -- the case on which the engine disagreed (required)
+	expected -- the change constructed by the reference engine (required)
+	actual -- the change constructed by the engine (required)
+	reason -- a short description of the disagreement (required)
+	"""
+
+	engine: str
+	case: ChangeCase
+	expected: Optional[list]
+	actual: Optional[list]
+	reason: str
+
+
+class TimingSummary(BaseModel):
+	""" Defines the distribution of call durations (in seconds) for a single engine."""
+
+	calls: int
+	total: float
+	mean: float
+	median: float
+	p95: float
+	max: float
+
+	@classmethod
+	def from_durations(cls, durations: list) -> 'TimingSummary':
+		"""Summarise a list of call durations."""
+
+		ordered = sorted(durations)
+		return cls(
+			calls=len(ordered),
+			total=sum(ordered),
+			mean=statistics.mean(ordered),
+			median=statistics.median(ordered),
+			# nearest-rank percentile
+			p95=ordered[math.ceil(0.95 * len(ordered)) - 1],
+			max=ordered[-1],
+		)
+
+
+class FuzzReport(BaseModel):
+	""" Defines the outcome of a differential fuzzing run.
+
+	Keyword arguments:
+	seed -- the seed used to generate the cases (required)
+	cases -- the number of cases generated (required)
+	mismatches -- every disagreement with the reference engine (required)
+	timings -- the timing distribution of each engine, including the reference engine (required)
+	"""
+
+	seed: int
+	cases: int
+	mismatches: List[Mismatch]
+	timings: Dict[str, TimingSummary]
+
+	@property
+	def passed(self) -> bool:
+		return not self.mismatches
+
+	def summary(self) -> str:
+		"""Returns a human readable summary of the run."""
+
+		lines = [f'seed={self.seed} cases={self.cases} mismatches={len(self.mismatches)}']
+		for name, t in self.timings.items():
+			lines.append(
+				f'{name}: mean={t.mean * 1e6:.1f}us median={t.median * 1e6:.1f}us '
+				f'p95={t.p95 * 1e6:.1f}us max={t.max * 1e6:.1f}us total={t.total:.4f}s'
+			)
+		return '\n'.join(lines)
+
+
+def generate_case(rng: random.Random, max_amount: int = 300, max_quantity: int = 20) -> ChangeCase:
+	"""Generate a random change-making case.
+
+	Cases are drawn from the machine's own denominations, from adversarial non-canonical
+	denominations (fixed and random), and from near-empty floats where most balances are 0.
+	Near-empty amounts are drawn from the float's total so that both feasible and barely
+	infeasible cases are generated.
+	"""
+
+	kind = rng.choice(['standard', 'non_canonical', 'random_denominations', 'near_empty'])
+
+	if kind == 'standard':
+		denominations = COIN_DENOMINATIONS
+	elif kind == 'non_canonical':
+		denominations = rng.choice(NON_CANONICAL_DENOMINATIONS)
+	elif kind == 'random_denominations':
+		denominations = rng.sample(range(1, 60), rng.randint(1, 6))
+	else:
+		denominations = rng.choice([COIN_DENOMINATIONS] + NON_CANONICAL_DENOMINATIONS)
+
+	if kind == 'near_empty':
+		coins = { d: rng.choice([0, 0, 0, 1, 1, 2]) for d in denominations }
+		# draw the amount from the float itself (plus a small overshoot) so that near-empty
+		# cases are not trivially infeasible because the amount exceeds the whole float
+		total = sum(d * q for d, q in coins.items())
+		amount = rng.randint(0, total + min(denominations))
+	else:
+		coins = { d: rng.randint(0, max_quantity) for d in denominations }
+		amount = rng.randint(0, max_amount)
+
+	return ChangeCase(
+		kind=kind,
+		coins={ k: v for k, v in sorted(coins.items()) },
+		amount=amount,
+	)
+
+
+def _check_shape(actual) -> Optional[str]:
+	"""Returns the reason `actual` is not a change engine result (`None` or a list of ints), or `None` if it is."""
+
+	if actual is None:
+		return None
+
+	if not isinstance(actual, (list, tuple)):
+		return f'returned {type(actual).__name__}, expected list or None'
+
+	for c in actual:
+		if not isinstance(c, int) or isinstance(c, bool):
+			return f'returned a coin of type {type(c).__name__}, expected int'
+
+	return None
+
+
+def _check(expected: Optional[list], actual: Optional[list], coins: dict, amount: int) -> Optional[str]:
+	"""Returns the reason `actual` disagrees with `expected`, or `None` if they agree."""
+
+	if (expected is None) != (actual is None):
+		return 'feasibility differs'
+
+	if actual is None:
+		return None
+
+	if len(actual) != len(expected):
+		return f'coin count differs ({len(actual)} != {len(expected)})'
+
+	if sum(actual) != amount:
+		return f'coins sum to {sum(actual)} instead of {amount}'
+
+	for c, quantity in Counter(actual).items():
+		if quantity > coins.get(c, 0):
+			return f'uses {quantity} x {c}p but only {coins.get(c, 0)} available'
+
+	return None
+
+
+def fuzz_change_engines(engines: Dict[str, Callable[[dict, int], Optional[list]]], n_cases: int = 1000, seed: int = 0, max_amount: int = 300, max_quantity: int = 20) -> FuzzReport:
+	"""Differentially test change engines against `reference_construct_change`.
+
+	Each engine is called as `engine(coins, amount)` on the same seeded cases as the reference
+	engine, and must agree on feasibility and on the number of coins returned. Returned coins must
+	also sum to the amount and not exceed the available balances. An engine that raises, or that
+	returns anything other than `None` or a list of coins, is recorded as a mismatch and the run
+	continues. The call order, including the reference engine,
+	is shuffled for every case so that the timing distributions are comparable.
+
+	Keyword arguments:
+	engines -- a mapping of engine names to change engines (required)
+	n_cases -- the number of cases to generate (default: 1000)
+	seed -- the seed for the random case generator (default: 0)
+	max_amount -- the largest change amount to generate (default: 300)
+	max_quantity -- the largest balance of a single denomination to generate (default: 20)
+	"""
+
+	if REFERENCE_ENGINE in engines:
+		raise ValueError(f'Engine name `{REFERENCE_ENGINE}` is reserved for the reference engine.')
+
+	rng = random.Random(seed)
+	# the call order has its own generator, seeded differently from the case generator, so the
+	# shuffle neither replays the case stream nor changes the cases when other engines are passed
+	order_rng = random.Random(f'{seed}-order')
+	engines = { REFERENCE_ENGINE: reference_construct_change, **engines }
+	durations = { name: [] for name in engines }
+	mismatches = []
+
+	for _ in range(n_cases):
+		case = generate_case(rng, max_amount=max_amount, max_quantity=max_quantity)
+
+		# shuffle the call order so that no engine always pays for a cold cache by running first
+		order = list(engines)
+		order_rng.shuffle(order)
+
+		results = {}
+		for name in order:
+			# engines get their own copy so that one cannot corrupt the balances seen by another,
+			# made before the timer starts so that only the engine itself is timed
+			coins = dict(case.coins)
+			start = time.perf_counter()
+			try:
+				results[name] = engines[name](coins, case.amount)
+			except Exception as e:
+				results[name] = e
+			durations[name].append(time.perf_counter() - start)
+
+		expected = results.pop(REFERENCE_ENGINE)
+		if isinstance(expected, Exception):
+			raise expected
+
+		for name, actual in results.items():
+			if isinstance(actual, Exception):
+				# a crash on a valid case is a disagreement, not a reason to abort the run
+				reason = f'raised {type(actual).__name__}: {actual}'
+				actual = None
+			else:
+				# a malformed result is a disagreement too, and must not break the comparison below
+				reason = _check_shape(actual)
+				if reason is not None:
+					actual = None
+				else:
+					actual = None if actual is None else list(actual)
+					try:
+						reason = _check(expected, actual, case.coins, case.amount)
+					except Exception as e:
+						reason = f'check raised {type(e).__name__}: {e}'
+
+			if reason is not None:
+				mismatches.append(Mismatch(engine=name, case=case, expected=expected, actual=actual, reason=reason))
+
+	return FuzzReport(
+		seed=seed,
+		cases=n_cases,
+		mismatches=mismatches,
+		timings={ name: TimingSummary.from_durations(d) for name, d in durations.items() if d },
+	)
@@ -1,5 +1,4 @@
-from typing import Optional
-
+from src.app.change import reference_construct_change
 from src.app.product import ProductFactory
 from src.app.transaction import Transaction
 from src.app.fsm import FiniteStateMachine, State
@@ -120,34 +119,13 @@ class VendingMachine(FiniteStateMachine):
 		Returns a list containing the coins.
 		"""
 
-		def inner(coins: dict, amount: int) -> Optional[list]:
-			dp = [amount + 1] * (amount + 1)
-			lst = [None] * (amount + 1)
-			
-			dp[0] = 0
-			lst[0] = []
-
-			for c in coins:
-				for _ in range(coins[c]):
-					for a in range(amount, -1, -1):
-						if a - c < 0:
-							break
-
-						if a - c >= 0:
-							if 1 + dp[a - c] < dp[a]:
-								dp[a] = 1 + dp[a - c]
-								lst[a] = [c] + lst[a-c]
-									
-								
-			return lst[amount] if dp[amount] != amount + 1 else None
-		
 		# calculate the target amount we are aiming for
 		amount = self._calculate_change_required()
 		
 		# sort the existing vending machine coin balances by denomination
 		existing_coins = { k: v for k, v in sorted(self.balances.items()) }
 
-		return inner(existing_coins, amount)
+		return reference_construct_change(existing_coins, amount)
 
 	
 	def return_change(self) -> dict:
@@ -1,10 +1,13 @@
 from typing import Counter
+import random
 import pytest
 
 
 from src.app.vending_machine import VendingMachine, State
 from src.app.product import ProductFactory
 from src.app.transaction import Transaction
+from src.app.change import reference_construct_change
+from src.app.fuzzing import fuzz_change_engines, generate_case, TimingSummary, NON_CANONICAL_DENOMINATIONS, REFERENCE_ENGINE
 
 
 def test_invalid_product_name():
@@ -211,6 +214,137 @@ def test_vending_machine_construct_change_success():
 
 	for k in counter:
 		assert counter[k] == initial_balance[k] - final_balance[k]
-		
 
-	
\ No newline at end of file
+
+def test_reference_construct_change_non_canonical():
+	"""The reference engine returns the minimum number of coins on non-canonical denominations."""
+
+	assert sorted(reference_construct_change({1: 10, 3: 10, 4: 10}, 6)) == [3, 3]
+	assert reference_construct_change({2: 10, 3: 0}, 5) is None
+	assert reference_construct_change({1: 0, 2: 0}, 0) == []
+
+
+def test_generate_case_near_empty():
+	"""Near-empty floats produce both feasible and infeasible cases."""
+
+	rng = random.Random(0)
+	cases = [generate_case(rng) for _ in range(400)]
+	feasible = { reference_construct_change(dict(c.coins), c.amount) is not None for c in cases if c.kind == 'near_empty' }
+
+	assert feasible == { True, False }
+
+
+def test_generate_case_non_canonical():
+	"""Non-canonical cases never use the machine's own denominations."""
+
+	rng = random.Random(0)
+	cases = [generate_case(rng) for _ in range(400)]
+
+	assert all(sorted(c.coins) in NON_CANONICAL_DENOMINATIONS for c in cases if c.kind == 'non_canonical')
+
+
+def test_timing_summary_p95():
+	"""The p95 duration is the nearest-rank 95th percentile."""
+
+	assert TimingSummary.from_durations(list(range(1, 101))).p95 == 95
+	assert TimingSummary.from_durations(list(range(1, 21))).p95 == 19
+	assert TimingSummary.from_durations([3]).p95 == 3
+
+
+def test_fuzz_change_engines_matching_engine():
+	"""An engine that matches the reference engine passes and is timed alongside it."""
+
+	def bounded_dp(coins, amount):
+		best = { 0: [] }
+		for c, quantity in coins.items():
+			for _ in range(quantity):
+				for a in sorted(best, reverse=True):
+					if a + c <= amount and (a + c not in best or len(best[a]) + 1 < len(best[a + c])):
+						best[a + c] = best[a] + [c]
+		return best.get(amount)
+
+	report = fuzz_change_engines({ 'bounded_dp': bounded_dp }, n_cases=300, seed=7)
+
+	assert report.passed, report.mismatches[:3]
+	assert set(report.timings) == { REFERENCE_ENGINE, 'bounded_dp' }
+	assert report.timings['bounded_dp'].calls == 300
+
+
+def test_fuzz_change_engines_greedy_engine():
+	"""A greedy engine disagrees with the reference engine and the mismatches are reproducible."""
+
+	def greedy(coins, amount):
+		change = []
+		for c in sorted(coins, reverse=True):
+			while amount >= c and coins[c] > 0:
+				change.append(c)
+				coins[c] -= 1
+				amount -= c
+		return change if amount == 0 else None
+
+	report = fuzz_change_engines({ 'greedy': greedy }, n_cases=300, seed=7)
+	rerun = fuzz_change_engines({ 'greedy': greedy }, n_cases=300, seed=7)
+
+	assert not report.passed
+	assert [m.case for m in report.mismatches] == [m.case for m in rerun.mismatches]
+	assert { m.reason.split(' (')[0] for m in report.mismatches } >= { 'feasibility differs', 'coin count differs' }
+
+
+def test_fuzz_change_engines_raising_engine():
+	"""An engine that raises is recorded as a mismatch without aborting the run."""
+
+	def fragile(coins, amount):
+		if amount % 7 == 0:
+			raise RuntimeError('unlucky amount')
+		return reference_construct_change(coins, amount)
+
+	report = fuzz_change_engines({ 'fragile': fragile }, n_cases=100, seed=3)
+
+	assert not report.passed
+	assert all(m.reason == 'raised RuntimeError: unlucky amount' for m in report.mismatches)
+	assert all(m.case.amount % 7 == 0 and m.actual is None for m in report.mismatches)
+	assert report.timings['fragile'].calls == 100
+
+
+def test_fuzz_change_engines_wrong_return_type():
+	"""An engine that returns something other than a list of coins is recorded as a mismatch."""
+
+	def as_dict(coins, amount):
+		change = reference_construct_change(coins, amount)
+		return None if change is None else dict(Counter(change))
+
+	def bad_coins(coins, amount):
+		change = reference_construct_change(coins, amount)
+		return None if change is None else [None] * len(change)
+
+	report = fuzz_change_engines({ 'as_dict': as_dict, 'bad_coins': bad_coins }, n_cases=100, seed=3)
+
+	assert { m.reason for m in report.mismatches if m.engine == 'as_dict' } == { 'returned dict, expected list or None' }
+	assert { m.reason for m in report.mismatches if m.engine == 'bad_coins' } == { 'returned a coin of type NoneType, expected int' }
+	assert all(m.actual is None for m in report.mismatches)
+	assert report.timings['as_dict'].calls == 100
+
+
+def test_fuzz_change_engines_call_order():
+	"""Engines are not always called in the same order."""
+
+	calls = []
+
+	def first(coins, amount):
+		calls.append('first')
+		return reference_construct_change(coins, amount)
+
+	def second(coins, amount):
+		calls.append('second')
+		return reference_construct_change(coins, amount)
+
+	fuzz_change_engines({ 'first': first, 'second': second }, n_cases=50, seed=1)
+
+	assert set(calls[::2]) == { 'first', 'second' }
+
+
+def test_fuzz_change_engines_reserved_name():
+	"""The reference engine name cannot be reused."""
+
+	with pytest.raises(ValueError):
+		fuzz_change_engines({ REFERENCE_ENGINE: reference_construct_change })